@@ -16,10 +16,11 @@ class Side(enum.IntFlag):
 
 def find_closest(projectile, sprites):
     """Find sprite that is closest to projectile"""
+    center = projectile.last.center
 
     def keyfunc(sprite):
         """Sort by previous distance from center of previous position"""
-        return rect_distance(projectile.last.center, sprite.last)
+        return rect_distance(center, sprite.last)
 
     closest = min(sprites, key=keyfunc)
     return closest
@@ -96,9 +97,10 @@ def collision_move_to_edge(sprite1, sprite2):
 def collision_side(sprite1, sprite2):
     """Determine the side of collisions between 2 sprites"""
     result = collision_side_worker(sprite1, sprite2)
-    logging.debug("collision curr %s %s", sprite1.rect, sprite2.rect)
-    logging.debug("collision prev %s %s", sprite1.last, sprite2.last)
-    logging.debug("collision side %s", str(result))
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug("collision curr %s %s", sprite1.rect, sprite2.rect)
+        logging.debug("collision prev %s %s", sprite1.last, sprite2.last)
+        logging.debug("collision side %s", str(result))
     return result
 
 
@@ -107,108 +109,83 @@ def collision_side_worker(sprite1, sprite2):
 
     Code from https://hopefultoad.blogspot.com/2017/09/code-example-for-2d-aabb-collision.html
     """
+    rect1 = sprite1.rect
+    last1 = sprite1.last
+    rect2 = sprite2.rect
+    last2 = sprite2.last
 
-    corner_rise = 0
-    corner_run = 0
+    vel_rise_2 = rect2.centery - last2.centery
+    vel_run_2 = rect2.centerx - last2.centerx
 
-    vel_rise_1 = sprite1.rect.centery - sprite1.last.centery
-    vel_run_1 = sprite1.rect.centerx - sprite1.last.centerx
+    vel_rise = rect1.centery - last1.centery - vel_rise_2
+    vel_run = rect1.centerx - last1.centerx - vel_run_2
+    sprite1_prev = last1.move(vel_run_2, vel_rise_2)
 
-    vel_rise_2 = sprite2.rect.centery - sprite2.last.centery
-    vel_run_2 = sprite2.rect.centerx - sprite2.last.centerx
+    return edge_side(sprite1_prev.left, sprite1_prev.top,
+                     sprite1_prev.right, sprite1_prev.bottom,
+                     rect2.left, rect2.top, rect2.right, rect2.bottom,
+                     vel_rise, vel_run)
 
-    vel_rise = vel_rise_1 - vel_rise_2
-    vel_run = vel_run_1 - vel_run_2
-    sprite1_prev = sprite1.last.move(vel_run_2, vel_rise_2)
 
-    # Stores what sides might have been collided with
-    potential = Side.NONE
+def build_edge_sides():
+    """Build the table of collision sides, indexed by the edge mask of edge_side
 
-    if sprite1_prev.right <= sprite2.rect.left:
-        # Did not collide with right side might have collided with left side
-        potential |= Side.LEFT
-
-        corner_run = sprite2.rect.left - sprite1_prev.right
-
-        if sprite1_prev.bottom <= sprite2.rect.top:
-            # Might have collided with top side
-            potential |= Side.TOP
-            corner_rise = sprite2.rect.top - sprite1_prev.bottom
-        elif sprite1_prev.top >= sprite2.rect.bottom:
-            # Might have collided with bottom side
-            potential |= Side.BOTTOM
-            corner_rise = sprite2.rect.bottom - sprite1_prev.top
-        else:
-            # Did not collide with top side or bottom side or right side
-            return Side.LEFT
-    elif sprite1_prev.left >= sprite2.rect.right:
-        # Did not collide with left side might have collided with right side
-        potential |= Side.RIGHT
-
-        corner_run = sprite1_prev.left - sprite2.rect.right
-
-        if sprite1_prev.bottom <= sprite2.rect.top:
-            # Might have collided with top side
-            potential |= Side.TOP
-            corner_rise = sprite1_prev.bottom - sprite2.rect.top
-        elif sprite1_prev.top >= sprite2.rect.bottom:
-            # Might have collided with bottom side
-            potential |= Side.BOTTOM
-            corner_rise = sprite1_prev.top - sprite2.rect.bottom
-        else:
-            # Did not collide with top side or bottom side or left side
-            return Side.RIGHT
-    else:
-        # Did not collide with either left or right side
-        # must be top side, bottom side, or none
-        if sprite1_prev.bottom <= sprite2.rect.top:
-            return Side.TOP
-        elif sprite1_prev.top >= sprite2.rect.bottom:
-            return Side.BOTTOM
+    Mask bits are 1: clear of the left edge, 2: clear of the right edge,
+    4: clear of the top edge, 8: clear of the bottom edge.  None marks a corner
+    approach that needs the slope comparison.
+    """
+    table = []
+    for mask in range(16):
+        if mask & 1 or mask & 2:
+            side = None if mask & 12 else (Side.LEFT if mask & 1 else Side.RIGHT)
+        elif mask & 4:
+            side = Side.TOP
+        elif mask & 8:
+            side = Side.BOTTOM
         else:
             # Previous hitbox of moving object was already colliding with stationary object
-            return Side.NONE
-
-    # Corner case might have collided with more than one side
-    # Compare slopes to see which side was collided with
-    return collide_slopes(potential,
-                          vel_rise,
-                          vel_run,
-                          corner_rise,
-                          corner_run)
-
-
-def collide_slopes(potential, vel_rise, vel_run, corner_rise, corner_run):
-    """Check for collision using slope between corners"""
-    if vel_run == 0:
-        vel_run = 0.001
-
-    if corner_run == 0:
-        corner_run = 0.001
-
-    vel_slope = vel_rise / vel_run
-    corner_slope = corner_rise / corner_run
-
-    if (potential & Side.TOP) == Side.TOP:
-        if (potential & Side.LEFT) == Side.LEFT:
-            if vel_slope < corner_slope:
-                return Side.TOP
-            else:
-                return Side.LEFT
-        elif (potential & Side.RIGHT) == Side.RIGHT:
-            if vel_slope > corner_slope:
-                return Side.TOP
-            else:
-                return Side.RIGHT
-    elif (potential & Side.BOTTOM) == Side.BOTTOM:
-        if (potential & Side.LEFT) == Side.LEFT:
-            if vel_slope > corner_slope:
-                return Side.BOTTOM
-            else:
-                return Side.LEFT
-        elif (potential & Side.RIGHT) == Side.RIGHT:
-            if vel_slope < corner_slope:
-                return Side.BOTTOM
-            else:
-                return Side.RIGHT
-    return Side.NONE
+            side = Side.NONE
+        table.append(side)
+    return tuple(table)
+
+
+EDGE_SIDES = build_edge_sides()
+
+# Corner approach sides, indexed by top << 1 | left, then by whether the velocity
+# slope is at least the corner slope
+CORNER_SIDES = (
+    (Side.BOTTOM, Side.RIGHT),
+    (Side.BOTTOM, Side.LEFT),
+    (Side.TOP, Side.RIGHT),
+    (Side.TOP, Side.LEFT),
+)
+
+
+def edge_side(left1, top1, right1, bottom1,     # pylint: disable=too-many-arguments
+              left2, top2, right2, bottom2,
+              vel_rise, vel_run):
+    """Determine the side of collision from plain integer edges
+
+    Edges 1 are the previous projectile position relative to the target, edges 2
+    are the target, and the velocity is the relative velocity of the projectile.
+    """
+    dx_left = left2 - right1
+    dx_right = left1 - right2
+    dy_top = top2 - bottom1
+    dy_bottom = top1 - bottom2
+
+    mask = (dx_left >= 0) | (dx_right >= 0) << 1 | (dy_top >= 0) << 2 | (dy_bottom >= 0) << 3
+    side = EDGE_SIDES[mask]
+    if side is not None:
+        return side
+
+    # Approaching a corner - compare the slope of the velocity to the slope
+    # between the corners, mirrored so every corner uses the same comparison
+    top = mask >> 2 & 1
+    left = mask & 1
+    corner_rise = (dy_bottom, dy_top)[top]
+    corner_run = (dx_right, dx_left)[left] or 0.001
+    if top != left:
+        vel_rise = -vel_rise
+
+    return CORNER_SIDES[top << 1 | left][vel_rise / (vel_run or 0.001) >= corner_rise / corner_run]
@@ -41,6 +41,7 @@ class Window:
 
         self.main = pygame.display.set_mode(screen_size, flags)
         self.screen = pygame.Surface(world_size)
+        self.scaled = None
 
         logging.warning("Driver: %s", pygame.display.get_driver())
         logging.warning("Display Info:\n    %s", str(pygame.display.Info()))
@@ -69,10 +70,13 @@ class Window:
 
         self.main.fill(utils.color(utils.config["bg_color"]))
 
-        scaled = pygame.transform.scale(self.screen,
-                                        (world_size[0] * x_mult, world_size[1] * y_mult))
+        # Scale into a reused surface rather than allocating a new one every frame
+        scaled_size = (world_size[0] * x_mult, world_size[1] * y_mult)
+        if self.scaled is None or self.scaled.get_size() != scaled_size:
+            self.scaled = pygame.Surface(scaled_size, 0, self.screen)
+        pygame.transform.scale(self.screen, scaled_size, self.scaled)
 
-        self.main.blit(scaled, (x_offset, y_offset))
+        self.main.blit(self.scaled, (x_offset, y_offset))
 
         pygame.display.flip()
 
@@ -169,8 +173,9 @@ def get_font(name):
     return font
 
 
+@functools.lru_cache(maxsize=256)
 def draw_text(text, font_name=None):
-    """Return a surface with the given text"""
+    """Return a surface with the given text, with caching"""
     font = get_font(font_name)
     surface = font.render(text)
     return surface
@@ -200,10 +205,28 @@ def get_image(name):
     return image
 
 
+@functools.lru_cache(maxsize=None)
+def get_animation(name):
+    "Fetch the frame images of an animation from cache"
+    logging.warning("Animation cache miss: %s", name)
+    cfg = utils.config["animations"][name]
+    return tuple(get_image(image) for image in cfg["images"])
+
+
+@functools.lru_cache(maxsize=None)
+def get_animation_settings(name):
+    "Fetch the frame images, speed, and loop flag of an animation from cache"
+    cfg = utils.config["animations"][name]
+    return get_animation(name), cfg["speed"], cfg.get("loop")
+
+
 def init():
-    """Pre-load fonts and images into cache"""
+    """Pre-load fonts, images, and animations into cache"""
     for name in utils.config["fonts"]:
         get_font(name)
 
     for name in utils.config["images"]:
         get_image(name)
+
+    for name in utils.config["animations"]:
+        get_animation_settings(name)
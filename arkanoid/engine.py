@@ -3,9 +3,7 @@ Main game engine for Arkanoid
 """
 
 import gc
-import itertools
 import logging
-import re
 
 import pygame
 
@@ -17,6 +15,26 @@ import levels
 import systems
 import utils
 
+# Bind the pygame constants checked on every input event to skip the module lookups
+QUIT = pygame.QUIT
+KEYDOWN = pygame.KEYDOWN
+MOUSEMOTION = pygame.MOUSEMOTION
+MOUSEBUTTONS = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+K_ESCAPE = pygame.K_ESCAPE
+K_UP = pygame.K_UP
+K_DOWN = pygame.K_DOWN
+K_LEFT = pygame.K_LEFT
+K_RIGHT = pygame.K_RIGHT
+SELECT_KEYS = (pygame.K_SPACE, pygame.K_RETURN)
+
+# Queued event types that no state handles - blocked so SDL drops them before they reach Python
+IGNORED_EVENTS = [pygame.ACTIVEEVENT, pygame.KEYUP, pygame.VIDEOEXPOSE,
+                  pygame.JOYAXISMOTION, pygame.JOYBALLMOTION, pygame.JOYHATMOTION,
+                  pygame.JOYBUTTONUP, pygame.JOYBUTTONDOWN]
+
+# HUD sprites of the player that is not playing, keyed by the current player
+OTHER_PLAYER_HUD = {1: ("2UP", "score2"), 2: ("1UP", "score1")}
+
 
 class State:
     """Base class for game engine states"""
@@ -25,6 +43,7 @@ class State:
     def __init__(self, engine, data):
         self.engine = engine
         self.scene = None
+        self.life_sprites = None
 
     def stop(self):
         """Stop handler"""
@@ -34,7 +53,7 @@ class State:
         """Process input event"""
 
         # Most states will return to the Title state on Esc
-        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+        if event.type == KEYDOWN and event.key == K_ESCAPE:
             self.engine.set_state(TitleState, {})
 
     def update(self):
@@ -48,31 +67,32 @@ class State:
     def fix_banner(self):
         """Fix the banner sprites for the number of players"""
         if self.engine.vars["players"] == 1:
-            self.scene.names["2UP"].kill()
-            self.scene.names["score2"].kill()
+            for name in OTHER_PLAYER_HUD[1]:
+                self.scene.names[name].kill()
 
     def fix_hud(self):
         """Fix the HUD sprites for the current player"""
-        if self.engine.vars["player"] == 1:
-            self.scene.names["2UP"].kill()
-            self.scene.names["score2"].kill()
-        else:
-            self.scene.names["1UP"].kill()
-            self.scene.names["score1"].kill()
+        for name in OTHER_PLAYER_HUD[self.engine.vars["player"]]:
+            self.scene.names[name].kill()
 
         self.fix_lives()
 
     def fix_lives(self):
         """Update the life sprites"""
+        # Find the numbered life sprites once rather than scanning the scene each time
+        if self.life_sprites is None:
+            self.life_sprites = []
+            for name, sprite in self.scene.names.items():
+                if name.startswith("life") and name[4:].isdigit():
+                    self.life_sprites.append((int(name[4:]), sprite))
+
         lives = self.engine.get_lives()
-        for name, sprite in self.scene.names.items():
-            mobj = re.match("life(\\d+)", name)
-            if mobj:
-                num = int(mobj.group(1))
-                if lives <= num:
-                    sprite.kill()
-                else:
-                    self.scene.groups["all"].add(sprite)
+        group_all = self.scene.groups["all"]
+        for num, sprite in self.life_sprites:
+            if lives <= num:
+                sprite.kill()
+            else:
+                group_all.add(sprite)
 
 
 class SplashState(State):
@@ -103,7 +123,7 @@ class SplashState(State):
 
     def on_keydown(self, event):
         """Skip to title menu when key is pressed"""
-        if event.key in [pygame.K_SPACE, pygame.K_RETURN]:
+        if event.key in SELECT_KEYS:
             self.engine.set_state(TitleState, {})
 
     def update(self):
@@ -127,6 +147,7 @@ class TitleState(State):
         utils.events.register(utils.Event.MOUSEMOTION, self.on_motion)
         utils.events.register(utils.Event.KEYDOWN, self.on_keydown)
         utils.events.register(utils.Event.VAR_CHANGE, self.on_var_change)
+        utils.events.generate(utils.Event.VAR_REQUEST, name="players")
 
         # Performance isn't a concern - enable background work and release the mouse
         display.release_mouse()
@@ -142,7 +163,7 @@ class TitleState(State):
 
     def input(self, event):
         # Quit the program in this state on ESCAPE
-        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+        if event.type == KEYDOWN and event.key == K_ESCAPE:
             return True
         return False
 
@@ -169,11 +190,11 @@ class TitleState(State):
 
     def on_keydown(self, event):
         """Track key presses to select players or start game"""
-        if event.key == pygame.K_UP:
+        if event.key == K_UP:
             self.engine.vars["players"] = 1
-        elif event.key == pygame.K_DOWN:
+        elif event.key == K_DOWN:
             self.engine.vars["players"] = 2
-        elif event.key in [pygame.K_SPACE, pygame.K_RETURN]:
+        elif event.key in SELECT_KEYS:
             self.engine.set_state(BlinkState, {})
 
     def draw(self, screen):
@@ -284,9 +305,13 @@ class BreakState(State):
 
         self.paddle.break_()
 
+        names = self.scene.names
+        self.update_sprites = tuple(names[name] for name in
+                                    ["high", "score1", "score2", "break", "paddle"])
+
     def update(self):
-        for name in ["high", "score1", "score2", "break", "paddle"]:
-            self.scene.names[name].update()
+        for sprite in self.update_sprites:
+            sprite.update()
 
         if not self.paddle.alive():
             self.engine.next_level()
@@ -309,9 +334,13 @@ class DeathState(State):
 
         self.paddle.kill()
 
+        names = self.scene.names
+        self.update_sprites = tuple(names[name] for name in
+                                    ["high", "score1", "score2", "paddle"])
+
     def update(self):
-        for name in ["high", "score1", "score2", "paddle"]:
-            self.scene.names[name].update()
+        for sprite in self.update_sprites:
+            sprite.update()
 
         if not self.paddle.alive():
             lives = self.engine.get_lives() - 1
@@ -364,9 +393,12 @@ class ClearState(State):
         else:
             utils.timers.start(2.0, self.engine.next_level)
 
+        names = self.scene.names
+        self.update_sprites = tuple(names[name] for name in ["high", "score1", "score2"])
+
     def update(self):
-        for name in ["high", "score1", "score2"]:
-            self.scene.names[name].update()
+        for sprite in self.update_sprites:
+            sprite.update()
 
         if self.doh:
             self.doh.update()
@@ -396,6 +428,16 @@ class GameState(State):
 
         self.fix_hud()
 
+        # Bind the groups used every frame to skip the dict lookups
+        self.group_all = self.scene.groups["all"]
+        self.group_ball = self.scene.groups["ball"]
+        self.group_balls = self.scene.groups["balls"]
+        self.group_bricks = self.scene.groups["bricks"]
+        self.group_break = self.scene.groups["break"]
+        self.group_lasers = self.scene.groups["lasers"]
+        self.group_paddle = self.scene.groups["paddle"]
+        self.paddle_hitters = (self.group_balls, self.group_paddle)
+
         self.playspace = self.scene.names["bg"].rect
         self.scene.names["ball2"].kill()
         self.scene.names["ball3"].kill()
@@ -409,6 +451,9 @@ class GameState(State):
 
         self.capsules = systems.Capsules(self, self.paddle)
 
+        # Bricks only lose hits to projectiles, so only recount after a projectile hit
+        self.recount_bricks = True
+
         utils.events.register(utils.Event.MOUSEBUTTONDOWN, self.on_click)
         utils.events.register(utils.Event.MOUSEMOTION, self.on_motion)
         utils.events.register(utils.Event.KEYDOWN, self.on_keydown)
@@ -441,11 +486,15 @@ class GameState(State):
 
     def next_life_threshold(self):
         """Calculate next score threshold for a free life"""
+        # 20000, then every multiple of 60000
         score = self.engine.get_score()
-        for threshold in itertools.chain([20000], itertools.count(60000, 60000)):
-            if score < threshold:
-                logging.info("Next score threshold:%d", threshold)
-                return threshold
+        if score < 20000:
+            threshold = 20000
+        else:
+            threshold = (score // 60000 + 1) * 60000
+
+        logging.info("Next score threshold:%d", threshold)
+        return threshold
 
     def speed_timer(self):
         """Start the ball speed timer"""
@@ -454,14 +503,17 @@ class GameState(State):
 
     def on_timer(self):
         """Increase ball speed and start the timer again"""
-        new_speed = self.ball_speed * utils.config["ball_speed_multiplier"]
+        multiplier = utils.config["ball_speed_multiplier"]
+        new_speed = self.ball_speed * multiplier
         if new_speed <= utils.config["max_ball_speed"]:
             self.ball_speed = new_speed
 
-            for ball in self.scene.groups["balls"]:
-                if isinstance(ball.action, entities.Move):
-                    ball.action.delta = [i * utils.config["ball_speed_multiplier"]
-                                         for i in ball.action.delta]
+            # Scale the velocities in place
+            for ball in self.group_balls:
+                action = ball.action
+                if action and action.is_move:
+                    action.dx *= multiplier
+                    action.dy *= multiplier
 
         self.speed_timer()
 
@@ -477,7 +529,7 @@ class GameState(State):
 
     def on_keydown(self, event):
         """Generate a fire event on key presses"""
-        if event.key in [pygame.K_SPACE, pygame.K_RETURN]:
+        if event.key in SELECT_KEYS:
             utils.events.generate(utils.Event.FIRE)
 
     def on_points(self, event):
@@ -503,9 +555,9 @@ class GameState(State):
 
         # Calculate the direction the paddle should move
         direction = 0
-        if keys[pygame.K_LEFT]:
+        if keys[K_LEFT]:
             direction -= 1
-        if keys[pygame.K_RIGHT]:
+        if keys[K_RIGHT]:
             direction += 1
 
         # Send the motion event
@@ -516,15 +568,18 @@ class GameState(State):
     def update(self):
         self.keyboard_input()
 
-        self.scene.groups["all"].update()
+        self.group_all.update()
+
+        # Bind the lookups used inside the collision loops
+        scene = self.scene
+        collide = self.group_ball.collide
+        paddle = self.paddle.sprite
 
         # Paddle collisions
-        for group in [self.scene.groups["balls"], self.scene.groups["paddle"]]:
-            hitters = pygame.sprite.spritecollide(self.paddle.sprite,
-                                                  group,
-                                                  False)
+        for group in self.paddle_hitters:
+            hitters = group.collide(paddle)
             for sprite in hitters:
-                sprite.hit(self.scene)
+                sprite.hit(scene)
 
                 if sprite.cfg.get("effect"):
                     self.capsules.kill(sprite)
@@ -539,61 +594,68 @@ class GameState(State):
                 if sprite.cfg.get("paddle_bounce", False):
                     self.paddle.hit(sprite)
 
-        # Projectile collisions
-        projectiles = self.scene.groups["balls"].sprites()
-        projectiles += self.scene.groups["lasers"].sprites()
+        # Projectile collisions, destroying any ball that wanders off the playspace on the
+        # same pass.  Lasers only travel upward, so the exit check never applies to them.
+        bottom = self.playspace.bottom
+        lost_ball = False
+        projectiles = self.group_balls.sprites()
+        if self.group_lasers:
+            projectiles += self.group_lasers.sprites()
         for projectile in projectiles:
             # Hit the closest object and slide along the collsion edge.  Repeat a few more times
             # in case the slide hits other objects
             for attempt in range(3):
-                hitters = pygame.sprite.spritecollide(projectile,
-                                                      self.scene.groups["ball"],
-                                                      False)
+                hitters = collide(projectile)
 
                 if hitters:
                     closest = collision.find_closest(projectile, hitters)
+                    self.recount_bricks = True
 
                     logging.info("collision #%d Count %d",
                                  attempt,
                                  len(hitters))
-                    logging.debug("proj %s", projectile.rect)
-                    for sprite in hitters:
-                        logging.debug("targ %s", sprite.rect)
+                    if logging.getLogger().isEnabledFor(logging.DEBUG):
+                        logging.debug("proj %s", projectile.rect)
+                        for sprite in hitters:
+                            logging.debug("targ %s", sprite.rect)
 
-                    projectile.hit(self.scene)
-                    closest.hit(self.scene)
+                    projectile.hit(scene)
+                    closest.hit(scene)
 
                     # Bounce the balls
-                    if projectile.alive() and isinstance(projectile.action, entities.Move):
+                    action = projectile.action
+                    if projectile.alive() and action and action.is_move:
                         side = collision.collision_side(projectile, closest)
-                        delta = projectile.action.delta
                         if side == collision.Side.BOTTOM:
-                            delta[1] = abs(delta[1])
+                            action.dy = abs(action.dy)
                             projectile.rect.top = closest.rect.bottom
                         elif side == collision.Side.TOP:
-                            delta[1] = -abs(delta[1])
+                            action.dy = -abs(action.dy)
                             projectile.rect.bottom = closest.rect.top
                         elif side == collision.Side.RIGHT:
-                            delta[0] = abs(delta[0])
+                            action.dx = abs(action.dx)
                             projectile.rect.left = closest.rect.right
                         elif side == collision.Side.LEFT:
-                            delta[0] = -abs(delta[0])
+                            action.dx = -abs(action.dx)
                             projectile.rect.right = closest.rect.left
                 else:
                     break
 
-        # Destroy anything that wanders off the playspace
-        for group in [self.scene.groups["paddle"], self.scene.groups["balls"]]:
-            for sprite in group:
-                if sprite.alive() and sprite.rect.top >= self.playspace.bottom:
-                    if sprite.cfg.get("effect"):
-                        self.capsules.kill(sprite)
-                    else:
-                        sprite.kill()
-
-        # Re-enable capsules when ball count drops to 1
-        balls = self.scene.groups["balls"].sprites()
-        if len(balls) == 1:
+            if projectile.rect.top >= bottom and projectile.alive():
+                projectile.kill()
+                lost_ball = True
+
+        # Destroy any capsule, alien or shot that wanders off the playspace
+        for sprite in self.group_paddle:
+            if sprite.rect.top >= bottom and sprite.alive():
+                if sprite.cfg.get("effect"):
+                    self.capsules.kill(sprite)
+                else:
+                    sprite.kill()
+
+        # Re-enable capsules when losing balls drops the count to 1
+        balls = len(self.group_balls)
+        if lost_ball and balls == 1:
             self.capsules.enable()
 
         # Check for death
@@ -602,21 +664,23 @@ class GameState(State):
                                   {"scene": self.scene, "paddle": self.paddle})
 
         # Level completion detection
-        remaining = sum([brick.cfg.get("hits", 0)
-                         for brick in self.scene.groups["bricks"].sprites()])
-        if remaining == 0:
-            self.paddle.stop()
-            self.engine.set_state(ClearState, {"scene": self.scene})
+        if self.recount_bricks:
+            self.recount_bricks = False
+            remaining = sum([brick.hits
+                             for brick in self.group_bricks.sprites()])
+            if remaining == 0:
+                self.paddle.stop()
+                self.engine.set_state(ClearState, {"scene": self.scene})
 
         # Break support
-        for sprite in self.scene.groups["break"]:
-            if self.paddle.sprite.rect.right >= sprite.rect.left:
+        for sprite in self.group_break:
+            if paddle.rect.right >= sprite.rect.left:
                 utils.events.generate(utils.Event.POINTS, points=10000)
                 self.engine.set_state(BreakState,
                                       {"scene": self.scene, "paddle": self.paddle})
 
     def draw(self, screen):
-        self.scene.groups["all"].draw(screen)
+        self.group_all.draw(screen)
 
 
 class VictoryState(State):
@@ -647,7 +711,7 @@ class VictoryState(State):
 
     def on_keydown(self, event):
         """Abort victory song on key press"""
-        if event.key in [pygame.K_SPACE, pygame.K_RETURN]:
+        if event.key in SELECT_KEYS:
             self.sound.stop()
 
     def update(self):
@@ -696,13 +760,17 @@ class Vars:
     """Track game variables"""
 
     def __init__(self, initial):
-        self.data = initial
+        self.data = dict(initial)
         utils.events.register(utils.Event.VAR_REQUEST, self.on_request)
 
     def __getitem__(self, key):
         return self.data[key]
 
     def __setitem__(self, key, value):
+        # Only announce actual changes - listeners fetch the initial value with VAR_REQUEST
+        if key in self.data and self.data[key] == value:
+            return
+
         self.data[key] = value
         utils.events.generate(utils.Event.VAR_CHANGE, name=key, value=value)
 
@@ -719,6 +787,9 @@ class Engine:
 
     def __init__(self):
         self.state = None
+        self.lives_key = None
+        self.score_key = None
+        self.level_key = None
         self.vars = Vars({
             "high": 0,
             "players": 1,
@@ -728,6 +799,7 @@ class Engine:
         self.level_data = levels.create_scene_configs(utils.config["levels"])
         self.level_data.update(utils.config["levels_custom"])
         utils.config["scenes"].update(self.level_data)
+        self.level_keys = {levels.parse_num(key): key for key in self.level_data}
 
         self.reset()
 
@@ -742,63 +814,62 @@ class Engine:
         self.vars["level"] = 1
         self.vars["level1"] = 1
         self.vars["level2"] = 1
-        self.vars["player"] = 1
+        self.set_player(1)
         self.vars["lives1"] = 3
         self.vars["lives2"] = 3
 
         # Create independent scenes for all levels for each player to track progress
         self.scenes = {}
         for player in range(1, self.vars["players"]+1):
-            self.scenes[player] = {levels.parse_num(key): entities.Scene([key])
-                                   for key in self.level_data}
+            self.scenes[player] = {num: entities.Scene([key])
+                                   for num, key in self.level_keys.items()}
+
+    def set_player(self, player):
+        """Set the current player and the names of their variables"""
+        self.vars["player"] = player
+        self.lives_key = "lives%d" % player
+        self.score_key = "score%d" % player
+        self.level_key = "level%d" % player
 
     def set_lives(self, lives):
         """Set the lives for the current player"""
-        player = self.vars["player"]
-        key = "lives1" if player == 1 else "lives2"
-        self.vars[key] = lives
+        self.vars[self.lives_key] = lives
 
-        logging.info("P%d Lives %d", player, lives)
+        logging.info("P%d Lives %d", self.vars["player"], lives)
 
     def get_lives(self):
         """Get the lives for the current player"""
-        key = "lives1" if self.vars["player"] == 1 else "lives2"
-        return self.vars[key]
+        return self.vars[self.lives_key]
 
     def set_score(self, score):
         """Set the score for the current player"""
-        player = self.vars["player"]
-        key = "score1" if player == 1 else "score2"
-        self.vars[key] = score
+        self.vars[self.score_key] = score
 
-        logging.info("P%d Score %d", player, score)
+        logging.info("P%d Score %d", self.vars["player"], score)
 
         if score > self.vars["high"]:
             self.vars["high"] = score
 
     def get_score(self):
         """Get the score for the current player"""
-        key = "score1" if self.vars["player"] == 1 else "score2"
-        return self.vars[key]
+        return self.vars[self.score_key]
 
     def set_level(self, level):
         """Set the level for the current player"""
         player = self.vars["player"]
-        key = "level1" if player == 1 else "level2"
-        self.vars[key] = level
+        self.vars[self.level_key] = level
         self.vars["level"] = level
         logging.info("P%d Level %d", player, level)
         return level in self.scenes[player]
 
     def get_level(self):
         """Get the level for the current player"""
-        key = "level1" if self.vars["player"] == 1 else "level2"
-        return self.vars[key]
+        return self.vars[self.level_key]
 
     def switch_player(self):
         """Switch to the next player (may be same player)"""
         for _ in range(self.vars["players"]):
-            self.vars["player"] = self.vars["player"] % self.vars["players"] + 1
+            self.set_player(self.vars["player"] % self.vars["players"] + 1)
 
             if self.get_lives() > 0:
                 self.set_level(self.get_level())
@@ -857,6 +928,7 @@ def main_loop():
     utils.init()                    # Lazy initialization to give time to set up logging
 
     pygame.init()
+    pygame.event.set_blocked(IGNORED_EVENTS)
 
     audio.init()                    # Pre-load cache
 
@@ -867,20 +939,40 @@ def main_loop():
     eng = EngineClass()
 
     clock = pygame.time.Clock()
+    frame_rate = utils.config["frame_rate"]
+    slow_frame = 2.0 / frame_rate
+    logger = logging.getLogger()
     frame_timer = utils.Delta()
     utilization_timer = utils.Delta()
 
+    # Bind the per-frame lookups to locals
+    get_events = pygame.event.get
+    screen = window.screen
+
     while True:
         utilization_timer.get()
 
-        # Event pump
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        # Event pump - drain the queue with a single pump per frame, then coalesce
+        # mouse motion into a single event ahead of the others
+        events = get_events()
+        motions = [event for event in events if event.type == MOUSEMOTION]
+        if motions:
+            rel_x = sum(event.rel[0] for event in motions)
+            rel_y = sum(event.rel[1] for event in motions)
+            others = [event for event in events if event.type != MOUSEMOTION]
+            events = [pygame.event.Event(MOUSEMOTION,
+                                         pos=motions[-1].pos,
+                                         rel=(rel_x, rel_y),
+                                         buttons=motions[-1].buttons)]
+            events += others
+
+        for event in events:
+            if event.type == QUIT:
                 return
-            elif event.type == pygame.MOUSEMOTION:
+            elif event.type == MOUSEMOTION:
                 event.pos = window.screen2world(event.pos, relative=False)
                 event.rel = window.screen2world(event.rel, relative=True)
-            elif event.type in [pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP]:
+            elif event.type in MOUSEBUTTONS:
                 event.pos = window.screen2world(event.pos, relative=False)
 
             if eng.input(event):
@@ -891,20 +983,22 @@ def main_loop():
 
         # Render
         window.clear()
-        eng.draw(window.screen)
+        eng.draw(screen)
 
         utime = utilization_timer.get()
 
         # Frame sync
-        clock.tick_busy_loop(utils.config["frame_rate"])
+        clock.tick_busy_loop(frame_rate)
         window.flip()
 
-        # FPS logging
+        # FPS logging - only gather the stats for slow frames or when debugging
         ftime = frame_timer.get()
-        utilization = utime / ftime * 100
-        fps = int(clock.get_fps())
-        if ftime > 2.0 / utils.config["frame_rate"]:
+        if ftime > slow_frame:
             logfunc = logging.warning
-        else:
+        elif logger.isEnabledFor(logging.DEBUG):
             logfunc = logging.debug
+        else:
+            continue
+        utilization = utime / ftime * 100
+        fps = int(clock.get_fps())
         logfunc("%d FPS %.3fs (%d%%)", fps, ftime, utilization)
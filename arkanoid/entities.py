@@ -15,6 +15,9 @@ class Action:
     "Base class for sprite actions"
     # pylint: disable=unused-argument, no-self-use, unnecessary-pass
 
+    # Set by Move and its subclasses so callers can test for a velocity without isinstance
+    is_move = False
+
     def then(self, action):
         "Perform the given action after this action completes"
         return Series([self, action])
@@ -127,16 +130,23 @@ class PaddleMove(Action):
 class Move(Action):
     "Move a sprite"
 
+    is_move = True
+
     def __init__(self, delta, frames=0):
-        self.delta = delta
-        self.total = [0, 0]
+        # Velocity and fractional movement are kept as scalars, not lists
+        self.dx, self.dy = delta
+        self.total_x = 0
+        self.total_y = 0
         self.frames = frames
 
     def update(self, sprite):
-        total = [t + d for t, d in zip(self.total, self.delta)]
-        delta = [int(i) for i in total]
-        self.total = [t-m for t, m in zip(total, delta)]
-        sprite.rect.move_ip(delta)
+        total_x = self.total_x + self.dx
+        total_y = self.total_y + self.dy
+        move_x = int(total_x)
+        move_y = int(total_y)
+        self.total_x = total_x - move_x
+        self.total_y = total_y - move_y
+        sprite.rect.move_ip(move_x, move_y)
 
         if self.frames > 0:
             self.frames -= 1
@@ -196,10 +206,7 @@ class Animate(Action):
     "Animate the sprite"
 
     def __init__(self, name, align="center"):
-        cfg = utils.config["animations"][name]
-        self.images = [display.get_image(name) for name in cfg["images"]]
-        self.speed = cfg["speed"]
-        self.loop = cfg.get("loop")
+        self.images, self.speed, self.loop = display.get_animation_settings(name)
         self.align = align
         self.frame = 0
         self.count = 0
@@ -340,6 +347,8 @@ class AlienEscape(Move):
 
     def __init__(self, scene):
         self.scene = scene
+        self.group_ball = scene.groups["ball"]
+        self.group_bricks = scene.groups["bricks"]
         self.states = [("down", "left"), ("left", "up"),
                        ("down", "right"), ("right", "up")]
         self.index = 0
@@ -362,9 +371,7 @@ class AlienEscape(Move):
         sprite.rect.move_ip(delta)
 
         # if it only collides with itself, we're good
-        others = pygame.sprite.spritecollide(sprite,
-                                             self.scene.groups["ball"],
-                                             False)
+        others = self.group_ball.collide(sprite)
         if len(others) == 1:
             success = True
 
@@ -382,8 +389,9 @@ class AlienEscape(Move):
             # Try the preferred directions first
             for direction in [first, second]:
                 if self.attempt(sprite, direction):
-                    self.delta = [i * self.speed
-                                  for i in self.tests[direction]]
+                    test_x, test_y = self.tests[direction]
+                    self.dx = test_x * self.speed
+                    self.dy = test_y * self.speed
                     Move.update(self, sprite)
                     return
 
@@ -399,7 +407,7 @@ class AlienEscape(Move):
 
         # check whether to change behavior
         rect = pygame.Rect(0, 0, 0, 0)
-        for brick in self.scene.groups["bricks"].sprites():
+        for brick in self.group_bricks.sprites():
             rect.union_ip(brick.rect)
 
         if sprite.rect.top >= rect.bottom:
@@ -498,6 +506,7 @@ class InletMgr(Action):
 
     def __init__(self, scene):
         self.scene = scene
+        self.group_aliens = scene.groups["aliens"]
         self.max_delay = 0
         self.max_aliens = 0
         self.frames = 0
@@ -514,7 +523,7 @@ class InletMgr(Action):
         if self.frames > 0:
             self.frames -= 1
         else:
-            if len(self.scene.groups["aliens"].sprites()) < self.max_aliens:
+            if len(self.group_aliens) < self.max_aliens:
                 return Animate("inlet_open").then(
                     Spawn("alien", self.scene).then(
                         Delay(1.0).then(
@@ -545,12 +554,12 @@ class DohMgr(Action):
     def set_open(self, sprite):
         "Open Doh's mouth"
         sprite.set_image(display.get_image("doh_open"))
-        sprite.cfg["hit_animation"] = "doh_hit_open"
+        sprite.hit_animation = "doh_hit_open"
 
     def set_closed(self, sprite):
         "Close Doh's mouth"
         sprite.set_image(display.get_image("doh"))
-        sprite.cfg["hit_animation"] = "doh_hit"
+        sprite.hit_animation = "doh_hit"
 
     def set_state(self, handler, delay):
         "Set the Doh state"
@@ -621,6 +630,13 @@ class Sprite(pygame.sprite.DirtySprite):
 
         self._layer = cfg.get("layer", 10)
 
+        # Bind the fields read on every hit to skip the dict lookups
+        self.hit_sound = cfg.get("hit_sound")
+        self.hit_animation = cfg.get("hit_animation")
+        self.hit_points = cfg.get("hit_points")
+        self.hits = cfg.get("hits", 0)
+        self.points = cfg.get("points", 0)
+
         key = self.cfg.get("text", "")
         if key:
             font = self.cfg.get("font", "white")
@@ -638,8 +654,7 @@ class Sprite(pygame.sprite.DirtySprite):
 
         key = self.cfg.get("animation", "")
         if key:
-            name = utils.config["animations"][key]["images"][0]
-            self.image = display.get_image(name)
+            self.image = display.get_animation(key)[0]
             self.animation = Animate(key)
 
         self.rect = self.image.get_rect()
@@ -679,10 +694,12 @@ class Sprite(pygame.sprite.DirtySprite):
         if self.animation:
             self.animation = self.animation.update(self)
 
-        # Update any active actions
+        # Update any active actions - most frames the action carries on, so
+        # only go through set_action when it actually changes
         if self.action:
             new_action = self.action.update(self)
-            self.set_action(new_action)
+            if new_action is not self.action:
+                self.set_action(new_action)
 
         # Notify any listeners of changes
         for callback in self.callbacks:
@@ -707,23 +724,18 @@ class Sprite(pygame.sprite.DirtySprite):
 
     def hit(self, scene):
         "Respond to a hit event"
-        sound = self.cfg.get("hit_sound")
-        if sound:
-            audio.play_sound(sound)
-
-        animation = self.cfg.get("hit_animation")
-        if animation:
-            self.animation = Animate(animation)
-
-        hit_points = self.cfg.get("hit_points")
-        if hit_points:
-            utils.events.generate(utils.Event.POINTS, points=hit_points)
-
-        hits = self.cfg.get("hits")
-        if hits:
-            hits -= 1
-            self.cfg["hits"] = hits
-            if hits == 0:
+        if self.hit_sound:
+            audio.play_sound(self.hit_sound)
+
+        if self.hit_animation:
+            self.animation = Animate(self.hit_animation)
+
+        if self.hit_points:
+            utils.events.generate(utils.Event.POINTS, points=self.hit_points)
+
+        if self.hits:
+            self.hits -= 1
+            if self.hits == 0:
                 self.kill()
 
                 death_animation = self.cfg.get("death_animation")
@@ -739,9 +751,63 @@ class Sprite(pygame.sprite.DirtySprite):
                     utils.events.generate(utils.Event.CAPSULE,
                                           position=self.rect.topleft)
 
-                points = self.cfg.get("points", 0)
-                if points:
-                    utils.events.generate(utils.Event.POINTS, points=points)
+                if self.points:
+                    utils.events.generate(utils.Event.POINTS, points=self.points)
+
+
+class Group(pygame.sprite.LayeredDirty):
+    "Sprite group that caches its rects for batched collision tests"
+
+    def __init__(self, *sprites, **kwargs):
+        self._collide_cache = None
+        pygame.sprite.LayeredDirty.__init__(self, *sprites, **kwargs)
+
+    def add_internal(self, sprite, layer=None):
+        pygame.sprite.LayeredDirty.add_internal(self, sprite, layer)
+
+        # Extend the snapshot when the sprite lands at the end of the layer
+        # order, as spawned capsules and shots do; otherwise rebuild it
+        if self._collide_cache is not None:
+            if self._spritelist[-1] is sprite:
+                sprites, rects = self._collide_cache
+                sprites.append(sprite)
+                rects.append(sprite.rect)
+            else:
+                self._collide_cache = None
+
+    def remove_internal(self, sprite):
+        pygame.sprite.LayeredDirty.remove_internal(self, sprite)
+
+        # Compact the snapshot in place rather than rebuilding it on the next
+        # collision test - bricks die far more often than sprites are added
+        if self._collide_cache is not None:
+            sprites, rects = self._collide_cache
+            index = sprites.index(sprite)
+            del sprites[index]
+            del rects[index]
+
+    def collide(self, sprite):
+        """Find the sprites in this group that collide with the given sprite
+
+        Equivalent to pygame.sprite.spritecollide(sprite, group, False), but the
+        rect scan runs in a single Rect.collidelistall call.
+        """
+        if self._collide_cache is None:
+            sprites = self.sprites()
+            self._collide_cache = (sprites, [other.rect for other in sprites])
+
+        sprites, rects = self._collide_cache
+        return [sprites[index] for index in sprite.rect.collidelistall(rects)]
+
+    def draw(self, surface, bgsurf=None, special_flags=None):
+        """Draw all visible sprites in layer order with a single Surface.blits call
+
+        The window is cleared every frame, so the dirty rect tracking of
+        LayeredDirty buys nothing and the whole group is redrawn instead.
+        """
+        surface.blits([(sprite.image, sprite.rect, sprite.source_rect, sprite.blendmode)
+                       for sprite in self._spritelist if sprite.visible], False)
+        return [surface.get_clip()]
 
 
 class Scene:
@@ -754,7 +820,7 @@ class Scene:
     - share definitions for block reuse
     - control persistence - some need to be reinstantiated, others need persistence
     """
-    Group = pygame.sprite.LayeredDirty
+    Group = Group
 
     def __init__(self, names):
         self.groups = {}
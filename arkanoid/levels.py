@@ -19,6 +19,92 @@ G = gold
 
 import re
 
+LEVEL_RE = re.compile(r"level(\d+)")
+BRICK_RE = re.compile(r"\S")
+
+# Brick configs that are the same on every level.  Level sprites copy these,
+# so the templates are shared rather than rebuilt per level.
+COLOR_BRICKS = {
+    "p": {
+        "image": "pink",
+        "hit_sound": "Med",
+        "hits": 1,
+        "groups": ["ball", "bricks"],
+        "points": 50,
+        "on_death": "create_capsule"
+    },
+
+    "o": {
+        "image": "orange",
+        "hit_sound": "Med",
+        "hits": 1,
+        "groups": ["ball", "bricks"],
+        "points": 60,
+        "on_death": "create_capsule"
+    },
+
+    "c": {
+        "image": "cyan",
+        "hit_sound": "Med",
+        "hits": 1,
+        "groups": ["ball", "bricks"],
+        "points": 70,
+        "on_death": "create_capsule"
+    },
+
+    "g": {
+        "image": "green",
+        "hit_sound": "Med",
+        "hits": 1,
+        "groups": ["ball", "bricks"],
+        "points": 80,
+        "on_death": "create_capsule"
+    },
+
+    "r": {
+        "image": "red",
+        "hit_sound": "Med",
+        "hits": 1,
+        "groups": ["ball", "bricks"],
+        "points": 90,
+        "on_death": "create_capsule"
+    },
+
+    "b": {
+        "image": "blue",
+        "hit_sound": "Med",
+        "hits": 1,
+        "groups": ["ball", "bricks"],
+        "points": 100,
+        "on_death": "create_capsule"
+    },
+
+    "m": {
+        "image": "purple",
+        "hit_sound": "Med",
+        "hits": 1,
+        "groups": ["ball", "bricks"],
+        "points": 110,
+        "on_death": "create_capsule"
+    },
+
+    "w": {
+        "image": "white",
+        "hit_sound": "Med",
+        "hits": 1,
+        "groups": ["ball", "bricks"],
+        "points": 120,
+        "on_death": "create_capsule"
+    }
+}
+
+GOLD_BRICK = {
+    "image": "gold",
+    "hit_sound": "High",
+    "hit_animation": "gold",
+    "groups": ["ball", "bricks"],
+}
+
 
 def create_sprites(num, data):
     "Create all the sprite data for a level"
@@ -26,11 +112,11 @@ def create_sprites(num, data):
 
     bricks = build_bricks(num)
     for row, rowdata in enumerate(data):
-        for col, char in enumerate(rowdata):
-            if char != " ":
-                brick = bricks[char].copy()
-                brick["position"] = [16 + 16 * col, 8 + 8 * row]
-                sprites.append(brick)
+        # Let the regex engine skip the empty cells
+        for mobj in BRICK_RE.finditer(rowdata):
+            col = mobj.start()
+            brick = dict(bricks[mobj.group()], position=[16 + 16 * col, 8 + 8 * row])
+            sprites.append(brick)
 
     return sprites
 
@@ -69,101 +155,22 @@ def build_bricks(num):
     silver_points = 50 * num
     silver_hits = 2 + (num - 1) // 8
 
-    bricks = {
-        "p": {
-            "image": "pink",
-            "hit_sound": "Med",
-            "hits": 1,
-            "groups": ["ball", "bricks"],
-            "points": 50,
-            "on_death": "create_capsule"
-        },
-
-        "o": {
-            "image": "orange",
-            "hit_sound": "Med",
-            "hits": 1,
-            "groups": ["ball", "bricks"],
-            "points": 60,
-            "on_death": "create_capsule"
-        },
-
-        "c": {
-            "image": "cyan",
-            "hit_sound": "Med",
-            "hits": 1,
-            "groups": ["ball", "bricks"],
-            "points": 70,
-            "on_death": "create_capsule"
-        },
-
-        "g": {
-            "image": "green",
-            "hit_sound": "Med",
-            "hits": 1,
-            "groups": ["ball", "bricks"],
-            "points": 80,
-            "on_death": "create_capsule"
-        },
-
-        "r": {
-            "image": "red",
-            "hit_sound": "Med",
-            "hits": 1,
-            "groups": ["ball", "bricks"],
-            "points": 90,
-            "on_death": "create_capsule"
-        },
-
-        "b": {
-            "image": "blue",
-            "hit_sound": "Med",
-            "hits": 1,
-            "groups": ["ball", "bricks"],
-            "points": 100,
-            "on_death": "create_capsule"
-        },
-
-        "m": {
-            "image": "purple",
-            "hit_sound": "Med",
-            "hits": 1,
-            "groups": ["ball", "bricks"],
-            "points": 110,
-            "on_death": "create_capsule"
-        },
-
-        "w": {
-            "image": "white",
-            "hit_sound": "Med",
-            "hits": 1,
-            "groups": ["ball", "bricks"],
-            "points": 120,
-            "on_death": "create_capsule"
-        },
-
-        "S": {
-            "image": "silver",
-            "hit_sound": "High",
-            "hit_animation": "silver",
-            "hits": silver_hits,
-            "groups": ["ball", "bricks"],
-            "points": silver_points,
-        },
-
-        "G": {
-            "image": "gold",
-            "hit_sound": "High",
-            "hit_animation": "gold",
-            "groups": ["ball", "bricks"],
-        },
+    bricks = dict(COLOR_BRICKS)
+    bricks["S"] = {
+        "image": "silver",
+        "hit_sound": "High",
+        "hit_animation": "silver",
+        "hits": silver_hits,
+        "groups": ["ball", "bricks"],
+        "points": silver_points,
     }
+    bricks["G"] = GOLD_BRICK
     return bricks
 
 
 def parse_num(key):
     "Parse the level number from the JSON key"
-    mobj = re.match(r"level(\d+)", key)
+    mobj = LEVEL_RE.match(key)
     assert mobj is not None, "Bad level key %s" % key
     return int(mobj.group(1))
 
@@ -8,6 +8,12 @@ import collision
 import entities
 import utils
 
+# Ball velocities off the paddle, from the far left zone to the far right zone
+PADDLE_VELOCITIES = ((-2, -1), (-1.6, -1.6), (-1, -2), (1, -2), (1.6, -1.6), (2, -1))
+
+# Velocities of the three disrupted balls, before the signs of the original ball are applied
+DISRUPT_VELOCITIES = ((1, 2), (1.6, 1.6), (2, 1))
+
 
 class Paddle:
     """Manage paddle behavior"""
@@ -138,26 +144,15 @@ class Paddle:
         sharp_thresh = half_width - 3
         mid_thresh = half_width - 8
 
-        if delta[0] < -sharp_thresh:
-            if delta[1] > 0:
-                vel = [-2, 1]
-            else:
-                vel = [-2, -1]
-        elif delta[0] < -mid_thresh:
-            vel = [-1.6, -1.6]
-        elif delta[0] < 0:
-            vel = [-1, -2]
-        elif delta[0] <= mid_thresh:
-            vel = [1, -2]
-        elif delta[0] <= sharp_thresh:
-            vel = [1.6, -1.6]
-        else:
-            if delta[1] > 0:
-                vel = [2, 1]
-            else:
-                vel = [2, -1]
+        zone = ((delta[0] >= -sharp_thresh) + (delta[0] >= -mid_thresh) + (delta[0] >= 0) +
+                (delta[0] > mid_thresh) + (delta[0] > sharp_thresh))
+        vel_x, vel_y = PADDLE_VELOCITIES[zone]
+
+        # The outer zones send a ball that is below the paddle center downwards
+        if delta[1] > 0 and zone in (0, 5):
+            vel_y = -vel_y
 
-        vel = [i * self.state.ball_speed for i in vel]
+        vel = (vel_x * self.state.ball_speed, vel_y * self.state.ball_speed)
 
         ball.set_action(entities.Move(vel))
         self.sound = audio.play_sound("Low")
@@ -274,13 +269,12 @@ class Capsules:
         elif effect == "disrupt":
             ball0 = self.scene.groups["balls"].sprites()[0]
             pos = ball0.rect.topleft
-            vel = ball0.action.delta
+            action = ball0.action
 
-            signs = [1 if vel[i] > 0 else -1 for i in range(2)]
-            vels = [[1, 2], [1.6, 1.6], [2, 1]]
-            vels = [[x * signs[0] * self.state.ball_speed,
-                     y * signs[1] * self.state.ball_speed]
-                    for x, y in vels]
+            speed = self.state.ball_speed
+            scale_x = speed if action.dx > 0 else -speed
+            scale_y = speed if action.dy > 0 else -speed
+            vels = [(x * scale_x, y * scale_y) for x, y in DISRUPT_VELOCITIES]
 
             for name, vel in zip(["ball1", "ball2", "ball3"], vels):
                 ball = self.scene.names[name]
@@ -296,12 +290,14 @@ class Capsules:
         elif effect == "player":
             utils.events.generate(utils.Event.EXTRA_LIFE)
         elif effect == "slow":
-            self.state.ball_speed /= utils.config["ball_speed_multiplier"]
+            multiplier = utils.config["ball_speed_multiplier"]
+            self.state.ball_speed /= multiplier
 
             for ball in self.scene.groups["balls"]:
-                if isinstance(ball.action, entities.Move):
-                    ball.action.delta = [i / utils.config["ball_speed_multiplier"]
-                                         for i in ball.action.delta]
+                action = ball.action
+                if action and action.is_move:
+                    action.dx /= multiplier
+                    action.dy /= multiplier
 
             self.state.speed_timer()
 
@@ -342,7 +338,7 @@ class Capsules:
             self.count -= 1
 
             if self.count == 0:
-                choices = [capsule for capsule in self.scene.groups["capsules"]
-                           for _ in range(capsule.cfg["weight"])]
-                capsule = utils.random.choice(choices)
+                capsules = self.scene.groups["capsules"].sprites()
+                weights = [capsule.cfg["weight"] for capsule in capsules]
+                capsule = utils.random.choices(capsules, weights)[0]
                 self.spawn(capsule, event.position)
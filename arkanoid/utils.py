@@ -6,6 +6,8 @@ General utilities
 
 import collections
 import enum
+import functools
+import heapq
 import json
 import logging
 import logging.config
@@ -35,7 +37,7 @@ def init():
 
 def set_config(fname, obj):
     """Write a JSON config file"""
-    with open(fname, "wb") as fout:
+    with open(fname, "w") as fout:
         json.dump(obj, fout)
 
 
@@ -78,18 +80,24 @@ class StreamToFunc:
 
 def lerp(pt1, pt2, ratio):
     """Generic linear interpolation"""
-    mixed = [(pt1[i] * ratio + pt2[i] * (1.0 - ratio))
-             for i in range(len(pt1))]
+    inverse = 1.0 - ratio
+    mixed = [(val1 * ratio + val2 * inverse) for val1, val2 in zip(pt1, pt2)]
     cast = type(pt1)
     final = cast(mixed)
     return final
 
 
+@functools.lru_cache(maxsize=None)
+def get_color(name):
+    """Convert a color name to an RGBA tuple, with caching"""
+    mycolor = pygame.Color(name)
+    return (mycolor.r, mycolor.g, mycolor.b, mycolor.a)
+
+
 def color(value):
     """Normalize a color value"""
     if isinstance(value, basestring):
-        mycolor = pygame.Color(value)
-        value = [mycolor.r, mycolor.g, mycolor.b, mycolor.a]
+        value = get_color(value)
     return value
 
 
@@ -132,22 +140,27 @@ class Events:
 
     def __init__(self):
         self.handlers = collections.defaultdict(set)
+        self.snapshots = {}
 
     def register(self, eventtype, handler):
         """Register a handler method for the given event"""
         handlers = self.handlers[eventtype]
         handlers.add(handler)
+        self.snapshots[eventtype] = tuple(handlers)
 
     def unregister(self, eventtype, handler):
         """Unregister a handler method for the given event"""
         handlers = self.handlers[eventtype]
         handlers.discard(handler)
+        self.snapshots[eventtype] = tuple(handlers)
 
     def handle(self, event):
         """Handle an incoming event"""
-        logging.debug("%s", Event(event.type))
-        handlers = self.handlers[event.type]
-        for handler in handlers.copy():
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("%s", Event(event.type))
+        # Dispatch from an immutable snapshot rebuilt whenever the handlers change, so
+        # handlers can register and unregister mid-dispatch without a copy per event
+        for handler in self.snapshots.get(event.type, ()):
             handler(event)
 
     def generate(self, event_type, **kwargs):
@@ -160,25 +173,34 @@ class Timers:
     """Invokes callbacks after a specified delay in frames"""
 
     def __init__(self):
-        self.timers = {}
+        self.frame = 0
+        self.count = 0
+        self.queue = []     # heap of [expiry frame, start order, handler, args, kwargs]
+        self.timers = {}    # handler -> its live queue entry
 
     def update(self):
         """Invoke any pending timers"""
-        initial_timers = list(self.timers.items())
-        for handler, [frames, args, kwargs] in initial_timers:
-            frames -= 1
+        self.frame += 1
+
+        # Only the timers that expire this frame are touched
+        queue = self.queue
+        while queue and queue[0][0] <= self.frame:
+            entry = heapq.heappop(queue)
+            _, _, handler, args, kwargs = entry
 
-            if frames <= 0:
-                self.cancel(handler)
+            # Skip entries that were cancelled or restarted since they were queued
+            if self.timers.get(handler) is entry:
+                del self.timers[handler]
                 handler(*args, **kwargs)
-            else:
-                self.timers[handler] = [frames, args, kwargs]
 
     def start(self, delay, handler, *args, **kwargs):
         """Start a timer callback with the specified delay and arguments"""
         fps = config["frame_rate"]
-        frames = int(delay * fps)
-        self.timers[handler] = [frames, args, kwargs]
+        frames = max(int(delay * fps), 1)
+        self.count += 1
+        entry = [self.frame + frames, self.count, handler, args, kwargs]
+        self.timers[handler] = entry
+        heapq.heappush(self.queue, entry)
 
     def cancel(self, handler):
         """Cancel a timer callback"""
@@ -189,11 +211,11 @@ class Delta:
     """Track time between calls to the millisecond"""
 
     def __init__(self):
-        self.last = time.time()
+        self.last = time.perf_counter()
 
     def get(self):
         """Get the time in milliseconds since last call"""
-        now = time.time()
+        now = time.perf_counter()
         delta = now - self.last
         self.last = now
         return delta